@@ -0,0 +1,481 @@
+"""
+The Percy Chronicles: Franchise Edition
+=======================================
+
+The XOR Club got famous. Now there are clubs all over Neural City, each with
+its own Percy, Larry and Ada, each watching a different queue of guests.
+
+Every night the clubs compare notes so they all learn the same lessons:
+they stand in a ring, and every club passes a slice of its "whispers of
+wisdom" (gradients) to its neighbour until everyone holds the sum of all of
+them - a ring all-reduce. Each club only ever talks to two neighbours, and
+each only ever sends about twice its own notes, no matter how big the ring.
+
+Each club is a worker process that runs the ordinary `NeuralNetwork.forward`
+on its own shard of guests. Clubs talk over plain TCP sockets, so they can
+live on different machines, or on localhost ports when telling the story on
+one box with `launch_local_workers`.
+"""
+
+import multiprocessing
+import queue
+import socket
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from neural_network import NeuralNetwork, mse
+
+# Every message on the wire is an 8-byte big-endian payload length followed
+# by the raw float64 bytes of the (flattened) gradient slice.
+_FRAME_HEADER = struct.Struct("!Q")
+_WIRE_DTYPE = np.dtype(np.float64)
+
+
+# ==============================================================================
+# Chapter 1: Passing Notes - Binary Framing Over TCP
+# ==============================================================================
+
+
+def _recv_exactly(sock, num_bytes):
+    """Keep listening until the whole note has arrived."""
+    buffer = bytearray(num_bytes)
+    view = memoryview(buffer)
+    received = 0
+    while received < num_bytes:
+        chunk_size = sock.recv_into(view[received:], num_bytes - received)
+        if chunk_size == 0:
+            raise ConnectionError("Neighbouring club hung up mid-note")
+        received += chunk_size
+    return buffer
+
+
+def send_array(sock, array):
+    """Send a 1-D float64 array as a single length-prefixed frame."""
+    payload = np.ascontiguousarray(array, dtype=_WIRE_DTYPE)
+    sock.sendall(_FRAME_HEADER.pack(payload.nbytes))
+    sock.sendall(memoryview(payload).cast("B"))
+
+
+def recv_array(sock):
+    """Receive one frame sent by `send_array` and return it as a float64 array."""
+    (num_bytes,) = _FRAME_HEADER.unpack(_recv_exactly(sock, _FRAME_HEADER.size))
+    return np.frombuffer(_recv_exactly(sock, num_bytes), dtype=_WIRE_DTYPE)
+
+
+# ==============================================================================
+# Chapter 2: The Ring of Clubs - Ring All-Reduce
+# ==============================================================================
+
+
+class RingCommunicator:
+    """
+    One club's place in the ring.
+
+    Each club listens on its own address for the club before it, and connects
+    to the club after it. Notes only ever flow one way round the ring.
+
+    addresses: list of (host, port) for every club, indexed by rank
+    rank: which club we are
+    connect_timeout: seconds to wait for the neighbours to show up
+    io_timeout: seconds a send or receive may stall before a neighbour is
+        given up on (socket.timeout / TimeoutError is raised)
+    """
+
+    def __init__(self, addresses, rank, connect_timeout=30.0, io_timeout=60.0):
+        self.addresses = addresses
+        self.rank = rank
+        self.world_size = len(addresses)
+        self.next_sock = None
+        self.prev_sock = None
+
+        # Sending happens on a helper thread, so a club can pass its note on
+        # while receiving one - otherwise a full ring of senders would deadlock
+        self._sender = ThreadPoolExecutor(max_workers=1)
+
+        if self.world_size > 1:
+            try:
+                self._connect(connect_timeout, io_timeout)
+            except BaseException:
+                self.close()
+                raise
+
+    def _connect(self, connect_timeout, io_timeout):
+        host, port = self.addresses[self.rank]
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind((host, port))
+            listener.listen(1)
+
+            # Knock on the next club's door until it opens. The listen backlog
+            # lets this succeed before the neighbour gets round to accepting.
+            next_address = self.addresses[(self.rank + 1) % self.world_size]
+            deadline = time.monotonic() + connect_timeout
+            while True:
+                try:
+                    self.next_sock = socket.create_connection(next_address)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.05)
+
+            listener.settimeout(connect_timeout)
+            self.prev_sock, _ = listener.accept()
+        finally:
+            listener.close()
+
+        for sock in (self.next_sock, self.prev_sock):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # A stalled neighbour should fail loudly, not hang the ring forever
+            sock.settimeout(io_timeout)
+
+    def _exchange(self, outgoing):
+        """Pass one slice to the next club while receiving one from the previous."""
+        pending_send = self._sender.submit(send_array, self.next_sock, outgoing)
+        incoming = recv_array(self.prev_sock)
+        pending_send.result()
+        return incoming
+
+    def allreduce(self, vector):
+        """
+        Sum `vector` across every club in the ring; every club gets the total.
+
+        1. Reduce-scatter: after world_size - 1 steps, each club owns the
+           complete sum for one slice of the vector.
+        2. All-gather: another world_size - 1 steps circulate those finished
+           slices until everybody has all of them.
+        """
+        total = np.array(vector, dtype=_WIRE_DTYPE)
+        if self.world_size == 1:
+            return total
+
+        size, rank = self.world_size, self.rank
+        slices = np.array_split(np.arange(total.size), size)
+        bounds = [(s[0], s[-1] + 1) if s.size else (0, 0) for s in slices]
+
+        for step in range(size - 1):
+            send_start, send_end = bounds[(rank - step) % size]
+            recv_start, recv_end = bounds[(rank - step - 1) % size]
+            incoming = self._exchange(total[send_start:send_end])
+            total[recv_start:recv_end] += incoming
+
+        for step in range(size - 1):
+            send_start, send_end = bounds[(rank + 1 - step) % size]
+            recv_start, recv_end = bounds[(rank - step) % size]
+            incoming = self._exchange(total[send_start:send_end])
+            total[recv_start:recv_end] = incoming
+
+        return total
+
+    def close(self):
+        self._sender.shutdown(wait=True)
+        for sock in (self.next_sock, self.prev_sock):
+            if sock is not None:
+                sock.close()
+
+
+# ==============================================================================
+# Chapter 3: Every Club Learns Together - The Distributed Trainer
+# ==============================================================================
+
+
+def _flatten(gradients):
+    return np.concatenate([g.ravel() for pair in gradients for g in pair])
+
+
+def _unflatten(vector, like):
+    gradients = []
+    offset = 0
+    for weight_like, bias_like in like:
+        pair = []
+        for template in (weight_like, bias_like):
+            pair.append(vector[offset : offset + template.size].reshape(template.shape))
+            offset += template.size
+        gradients.append(tuple(pair))
+    return gradients
+
+
+class DistributedTrainer:
+    """
+    Data-parallel training: every club keeps an identical copy of the network,
+    learns from its own shard of guests, and averages its whispers of wisdom
+    with the rest of the ring before anyone adjusts.
+
+    With `overlap=True`, the ring all-reduce for one batch runs on a background
+    thread while the club already runs the forward and backward pass of its
+    next batch. Those passes therefore see the weights from just before the
+    pending update lands - each gradient is the true gradient of a one-step-old
+    set of weights. Every club does the same, which keeps all replicas in
+    lockstep.
+
+    Sparse first-layer gradients are expanded to dense before the all-reduce,
+    so each step ships the full weight matrices round the ring.
+    """
+
+    def __init__(self, network, communicator):
+        self.network = network
+        self.communicator = communicator
+        self._reducer = ThreadPoolExecutor(max_workers=1)
+        self._broadcast_weights()
+
+    def _broadcast_weights(self):
+        """Make sure every club starts from the first club's opinions."""
+        params = [(layer.weights, layer.biases) for layer in self.network.layers]
+        local = _flatten(params)
+        if self.communicator.rank != 0:
+            local[:] = 0.0
+        for layer, (weights, biases) in zip(
+            self.network.layers, _unflatten(self.communicator.allreduce(local), params)
+        ):
+            layer.weights[...] = weights
+            layer.biases[...] = biases
+
+    def _average_gradients(self, gradients):
+        # Clubs see different sparse features, so sparse (touched_rows,
+        # row_adjustments) whispers are expanded to full matrices for the ring
+        dense_gradients = []
+        for layer, (weight_adjustments, bias_adjustments) in zip(
+            self.network.layers, gradients
+        ):
+            if isinstance(weight_adjustments, tuple):
+                touched_rows, row_adjustments = weight_adjustments
+                weight_adjustments = np.zeros_like(layer.weights)
+                weight_adjustments[touched_rows] = row_adjustments
+            dense_gradients.append((weight_adjustments, bias_adjustments))
+        gradients = dense_gradients
+
+        total = self.communicator.allreduce(_flatten(gradients))
+        return _unflatten(total / self.communicator.world_size, gradients)
+
+    def _check_same_num_batches(self, num_batches):
+        """Every club must take the same number of steps, or the ring stalls."""
+        world_size = self.communicator.world_size
+        total, total_squared = self.communicator.allreduce(
+            np.array([num_batches, num_batches**2], dtype=float)
+        )
+        # Zero variance across the ring means every club has the same count
+        mean = total / world_size
+        if total_squared / world_size - mean**2 > 1e-9:
+            raise ValueError(
+                f"Clubs have different numbers of batches (this club has "
+                f"{num_batches}, the ring averages {mean:g}; -1 marks a club "
+                f"whose labels don't match its guests); give every club the "
+                f"same number of batches"
+            )
+
+    def train(
+        self, X_shard, y_shard, epochs, learning_rate, batch_size=1, overlap=True
+    ):
+        """
+        Train on this club's shard. Every club must call this with the same
+        epochs, batch_size and number of batches; a mismatch in the number of
+        batches raises ValueError on every club before any training starts.
+        Returns the ring-averaged error of each epoch.
+
+        Decisions may be 1-D; they are reshaped to one row per guest.
+        """
+        num_guests = X_shard.shape[0]
+        y_shard = np.asarray(y_shard, dtype=float).reshape(
+            -1, self.network.layers[-1].weights.shape[1]
+        )
+        labels_match = len(y_shard) == num_guests
+
+        # A club with mismatched labels still joins the check (reporting an
+        # impossible batch count), so the rest of the ring fails with it
+        num_batches = int(np.ceil(num_guests / batch_size))
+        self._check_same_num_batches(num_batches if labels_match else -1)
+        if not labels_match:
+            raise ValueError(
+                f"Got {num_guests} guests but {len(y_shard)} decisions in this shard"
+            )
+        history = []
+
+        for epoch in range(epochs):
+            total_error = 0.0
+            pending = None
+
+            for batch_index in range(num_batches):
+                batch = slice(batch_index * batch_size, (batch_index + 1) * batch_size)
+                guest_features = X_shard[batch]
+                correct_decisions = y_shard[batch]
+
+                # 1. PREDICT (possibly while the previous batch's notes travel)
+                our_decisions = self.network.forward(guest_features)
+                total_error += mse(correct_decisions, our_decisions)
+
+                # 2. LEARN: write down the whispers against the same weights
+                # the forward pass just used
+                gradients = self.network.compute_gradients(
+                    correct_decisions, our_decisions
+                )
+
+                # Only now land the previous update, then share the new whispers
+                if pending is not None:
+                    self.network.apply_gradients(pending.result(), learning_rate)
+                    pending = None
+
+                if overlap:
+                    pending = self._reducer.submit(self._average_gradients, gradients)
+                else:
+                    self.network.apply_gradients(
+                        self._average_gradients(gradients), learning_rate
+                    )
+
+            if pending is not None:
+                self.network.apply_gradients(pending.result(), learning_rate)
+
+            epoch_error = (
+                self.communicator.allreduce(
+                    np.array([total_error / max(num_batches, 1)])
+                )[0]
+                / self.communicator.world_size
+            )
+            history.append(epoch_error)
+
+        return history
+
+    def close(self):
+        self._reducer.shutdown(wait=True)
+
+
+# ==============================================================================
+# Chapter 4: Opening Night Everywhere - Launching Local Clubs
+# ==============================================================================
+
+
+def _run_worker(
+    rank,
+    addresses,
+    layer_sizes,
+    X_train,
+    y_train,
+    epochs,
+    learning_rate,
+    batch_size,
+    overlap,
+    results,
+):
+    communicator = RingCommunicator(addresses, rank)
+    network = NeuralNetwork(layer_sizes)
+    trainer = DistributedTrainer(network, communicator)
+    try:
+        world_size = len(addresses)
+        history = trainer.train(
+            X_train[rank::world_size],
+            y_train[rank::world_size],
+            epochs,
+            learning_rate,
+            batch_size=batch_size,
+            overlap=overlap,
+        )
+        results.put((rank, [(l.weights, l.biases) for l in network.layers], history))
+    finally:
+        trainer.close()
+        communicator.close()
+
+
+def launch_local_workers(
+    layer_sizes,
+    X_train,
+    y_train,
+    num_workers,
+    epochs,
+    learning_rate,
+    batch_size=1,
+    overlap=True,
+    host="127.0.0.1",
+    base_port=29500,
+    poll_interval=0.1,
+):
+    """
+    Start `num_workers` clubs on localhost ports base_port, base_port + 1, ...
+    and train them together. Guests are dealt round-robin; if that leaves the
+    clubs with different numbers of batches, ValueError is raised up front.
+
+    Returns (network, history): a NeuralNetwork holding the first club's
+    trained weights, and the ring-averaged error per epoch. Raises
+    RuntimeError as soon as any club exits with an error.
+    """
+    num_guests = X_train.shape[0]
+    batches_per_club = {
+        int(np.ceil(len(range(rank, num_guests, num_workers)) / batch_size))
+        for rank in range(num_workers)
+    }
+    if len(batches_per_club) > 1:
+        raise ValueError(
+            f"{num_guests} guests dealt round-robin to {num_workers} clubs in "
+            f"batches of {batch_size} give uneven batch counts "
+            f"{sorted(batches_per_club)}; use a multiple of "
+            f"{num_workers * batch_size} guests"
+        )
+
+    addresses = [(host, base_port + rank) for rank in range(num_workers)]
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+
+    workers = [
+        context.Process(
+            target=_run_worker,
+            args=(
+                rank,
+                addresses,
+                layer_sizes,
+                X_train,
+                y_train,
+                epochs,
+                learning_rate,
+                batch_size,
+                overlap,
+                results,
+            ),
+        )
+        for rank in range(num_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    collected = {}
+    try:
+        while len(collected) < num_workers:
+            try:
+                rank, params, history = results.get(timeout=poll_interval)
+                collected[rank] = (params, history)
+            except queue.Empty:
+                pass
+
+            # A club that dies takes the whole ring down with it
+            failed = [w.exitcode for w in workers if w.exitcode not in (None, 0)]
+            if failed:
+                raise RuntimeError(
+                    f"{len(failed)} club(s) closed early: exit codes {failed}"
+                )
+    finally:
+        for worker in workers:
+            if len(collected) < num_workers and worker.is_alive():
+                worker.terminate()
+            worker.join()
+
+    params, history = collected[0]
+    network = NeuralNetwork(layer_sizes)
+    for layer, (weights, biases) in zip(network.layers, params):
+        layer.weights = weights
+        layer.biases = biases
+    return network, history
+
+
+if __name__ == "__main__":
+    print("🌆 The XOR Club opens franchises across Neural City!")
+
+    X_train = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+    y_train = np.array([[0], [1], [1], [0]])
+
+    franchise, history = launch_local_workers(
+        [2, 2, 1], X_train, y_train, num_workers=2, epochs=5000, learning_rate=10.0
+    )
+    print(f"📊 Final ring-averaged error: {history[-1]:.6f}")
+    for guest, decision in zip(X_train, franchise.forward(X_train)):
+        print(f"   {guest} → {decision[0]:.3f}")
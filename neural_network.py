@@ -51,6 +51,46 @@ def sigmoid_derivative(x):
     return x * (1 - x)
 
 
+def is_sparse(inputs):
+    """
+    Is this guest described by a sparse matrix (e.g. scipy.sparse.csr_matrix)?
+
+    Real guests have thousands of possible features - every hat brand, every
+    pair of glasses - but each one only wears a handful. Sparse matrices store
+    just the features a guest actually has, so Percy only looks at those.
+    """
+    return hasattr(inputs, "format") and hasattr(inputs, "nnz")
+
+
+def _require_csr(inputs):
+    """The team only reads sparse guests row by row - CSR - so insist on it."""
+    if inputs.format != "csr":
+        raise TypeError(
+            f"Sparse guests must be in CSR format, got {inputs.format!r}; "
+            f"convert with .tocsr()"
+        )
+
+
+def sparse_weight_gradient(inputs, responsibility):
+    """
+    The weight adjustments for a sparse batch, touching only the features seen.
+
+    Returns (touched_rows, row_adjustments): the sorted weight-row indices of
+    every feature that appeared in the batch, and the adjustment for each of
+    those rows. Work and memory scale with the non-zeros, not the feature count.
+    """
+    touched_rows, entry_to_row = np.unique(inputs.indices, return_inverse=True)
+    entry_to_guest = np.repeat(np.arange(inputs.shape[0]), np.diff(inputs.indptr))
+
+    row_adjustments = np.zeros((touched_rows.size, responsibility.shape[1]))
+    np.add.at(
+        row_adjustments,
+        entry_to_row,
+        inputs.data[:, np.newaxis] * responsibility[entry_to_guest],
+    )
+    return touched_rows, row_adjustments
+
+
 # ==============================================================================
 # Chapter 2: The Team Members - The Layer Class
 # ==============================================================================
@@ -99,13 +139,22 @@ class Layer:
         2. They weight those inputs based on their expertise (the weights matrix)
         3. They add their personal bias/inclination
         4. They express their final excitement level (through sigmoid)
+
+        `inputs` may also be a CSR sparse batch; then only the weight rows of
+        features the guests actually have take part in the discussion. Other
+        sparse formats raise TypeError.
         """
         self.inputs = inputs  # Remember what we saw (needed for learning later)
 
         # The team discussion: inputs × weights + biases
         # This is like Percy saying "I see a hat (input=1) and I care about hats
         # with strength 0.8 (weight), plus I'm generally hat-positive (bias=0.1)"
-        team_discussion = np.dot(inputs, self.weights) + self.biases
+        if is_sparse(inputs):
+            _require_csr(inputs)
+            # Sparse-dense product: the matrix does the work per non-zero
+            team_discussion = inputs @ self.weights + self.biases
+        else:
+            team_discussion = np.dot(inputs, self.weights) + self.biases
 
         # Convert the raw discussion into excitement levels (0 to 1)
         self.output = sigmoid(team_discussion)
@@ -177,12 +226,21 @@ class NeuralNetwork:
         4. Repeat (do it again, hopefully better)
         """
         print("🤖 Percy and Larry begin their training montage...")
+        sparse_guests = is_sparse(X_train)
+        if sparse_guests:
+            _require_csr(X_train)
+        num_guests = X_train.shape[0] if sparse_guests else len(X_train)
 
         for epoch in range(epochs):
             total_error = 0
 
+            # Sparse guests are taken as one-row CSR slices so they stay sparse
+            guests = X_train
+            if sparse_guests:
+                guests = (X_train[i : i + 1] for i in range(num_guests))
+
             # Practice with each training example
-            for guest_features, correct_decision in zip(X_train, y_train):
+            for guest_features, correct_decision in zip(guests, y_train):
                 # 1. PREDICT: What would we decide about this guest?
                 guest_features = guest_features.reshape(
                     1, -1
@@ -198,7 +256,7 @@ class NeuralNetwork:
 
             # Show the duo's progress every 100 rounds
             if (epoch + 1) % 100 == 0:
-                avg_error = total_error / len(X_train)
+                avg_error = total_error / num_guests
                 print(
                     f"📊 Training Round {epoch + 1}/{epochs}, Team Error: {avg_error:.6f}"
                 )
@@ -224,16 +282,75 @@ class NeuralNetwork:
             # (This is the "personalized coaching" step)
             responsibility = error_signal * sigmoid_derivative(layer.output)
 
-            # Figure out how to adjust the team's trust relationships (weights)
-            weight_adjustments = np.dot(layer.inputs.T, responsibility)
             bias_adjustments = np.sum(responsibility, axis=0, keepdims=True)
 
-            # Actually make the adjustments (the team gets slightly wiser)
-            layer.weights -= learning_rate * weight_adjustments
+            # Figure out how to adjust the team's trust relationships (weights)
+            # and actually make the adjustments (the team gets slightly wiser)
+            if is_sparse(layer.inputs):
+                # Only the features these guests actually had get coached
+                touched_rows, row_adjustments = sparse_weight_gradient(
+                    layer.inputs, responsibility
+                )
+                layer.weights[touched_rows] -= learning_rate * row_adjustments
+            else:
+                weight_adjustments = np.dot(layer.inputs.T, responsibility)
+                layer.weights -= learning_rate * weight_adjustments
             layer.biases -= learning_rate * bias_adjustments
 
-            # Pass the whisper to the previous layer
-            error_signal = np.dot(responsibility, layer.weights.T)
+            # Pass the whisper to the previous layer (the raw guest features
+            # at the entrance have nobody to whisper to)
+            if layer is not self.layers[0]:
+                error_signal = np.dot(responsibility, layer.weights.T)
+
+    def compute_gradients(self, correct_answer, our_guess):
+        """
+        The whispers of wisdom, written down instead of acted upon.
+
+        Same backward flow as `backward`, but nobody adjusts yet - each layer's
+        (weight_adjustments, bias_adjustments) pair is returned, first layer first.
+        This lets several clubs compare notes (see distributed_training.py)
+        before anyone changes their mind.
+
+        For a layer fed sparse guests, weight_adjustments is the pair
+        (touched_rows, row_adjustments) from `sparse_weight_gradient`, so memory
+        stays proportional to the features seen; `apply_gradients` accepts both.
+        """
+        error_signal = mse_derivative(correct_answer, our_guess)
+        gradients = []
+
+        for layer in reversed(self.layers):
+            responsibility = error_signal * sigmoid_derivative(layer.output)
+
+            if is_sparse(layer.inputs):
+                weight_adjustments = sparse_weight_gradient(
+                    layer.inputs, responsibility
+                )
+            else:
+                weight_adjustments = np.dot(layer.inputs.T, responsibility)
+            bias_adjustments = np.sum(responsibility, axis=0, keepdims=True)
+            gradients.append((weight_adjustments, bias_adjustments))
+
+            # Whisper backward using the weights as they were during the dance
+            if layer is not self.layers[0]:
+                error_signal = np.dot(responsibility, layer.weights.T)
+
+        gradients.reverse()
+        return gradients
+
+    def apply_gradients(self, gradients, learning_rate):
+        """
+        Act on written-down whispers: nudge every layer by its adjustments.
+        """
+        for layer, (weight_adjustments, bias_adjustments) in zip(
+            self.layers, gradients
+        ):
+            if isinstance(weight_adjustments, tuple):
+                # Sparse whispers: only the rows of features that were seen
+                touched_rows, row_adjustments = weight_adjustments
+                layer.weights[touched_rows] -= learning_rate * row_adjustments
+            else:
+                layer.weights -= learning_rate * weight_adjustments
+            layer.biases -= learning_rate * bias_adjustments
 
 
 # ==============================================================================
@@ -0,0 +1,227 @@
+"""
+The Percy Chronicles: The Night Never Ends
+==========================================
+
+The training montage in `NeuralNetwork.train` is a rehearsal: a fixed list of
+guests, practised a fixed number of times. But The XOR Club is open every
+night now, and guests keep arriving.
+
+So Percy and Larry learn on the job. Every small group of new guests is a
+lesson (`partial_fit`), mixed with a few remembered guests from earlier
+nights so the new crowd doesn't make them forget the old rules. Their memory
+is a fixed-size ring of seats - when it's full, the oldest memory makes room.
+
+Meanwhile the door never stops: Ada reads decisions from a published
+snapshot of the team's opinions. Learning changes a private copy, and a new
+snapshot only replaces the old one in a single step, so the door always sees
+one complete, consistent set of weights.
+"""
+
+import threading
+
+import numpy as np
+
+from neural_network import NeuralNetwork, is_sparse, mse, sigmoid
+
+# ==============================================================================
+# Chapter 1: The Memory Ring - A Bounded Replay Buffer
+# ==============================================================================
+
+
+class ReplayBuffer:
+    """
+    A fixed number of remembered guests, stored in arrays allocated once.
+
+    capacity: how many guests fit in memory (0 turns remembering off)
+    num_features / num_outputs: the size of a guest and of a decision
+    """
+
+    def __init__(self, capacity, num_features, num_outputs):
+        if capacity < 0:
+            raise ValueError(f"capacity must be 0 or more, got {capacity}")
+        self.capacity = capacity
+        self.features = np.zeros((capacity, num_features))
+        self.decisions = np.zeros((capacity, num_outputs))
+        self.size = 0
+        self._next_seat = 0
+
+    def add(self, guest_features, correct_decisions):
+        """Remember a batch of guests, overwriting the oldest when full."""
+        if self.capacity == 0:
+            return
+        guest_features = guest_features[-self.capacity :]
+        correct_decisions = correct_decisions[-self.capacity :]
+        num_guests = len(guest_features)
+
+        seats = (self._next_seat + np.arange(num_guests)) % self.capacity
+        self.features[seats] = guest_features
+        self.decisions[seats] = correct_decisions
+
+        self._next_seat = (self._next_seat + num_guests) % self.capacity
+        self.size = min(self.size + num_guests, self.capacity)
+
+    def sample(self, num_guests):
+        """Recall up to `num_guests` remembered guests at random."""
+        num_guests = min(num_guests, self.size)
+        seats = np.random.randint(0, self.size, size=num_guests)
+        return self.features[seats], self.decisions[seats]
+
+
+# ==============================================================================
+# Chapter 2: What the Door Sees - Published Snapshots
+# ==============================================================================
+
+
+class ModelSnapshot:
+    """
+    A frozen copy of the team's opinions that the door can read safely.
+
+    Unlike `NeuralNetwork.forward`, predicting from a snapshot never writes
+    to any shared state, so any number of threads can use it at once.
+    """
+
+    def __init__(self, network, version):
+        self.version = version
+        self.parameters = []
+        for layer in network.layers:
+            weights, biases = layer.weights.copy(), layer.biases.copy()
+            weights.flags.writeable = False
+            biases.flags.writeable = False
+            self.parameters.append((weights, biases))
+
+    def forward(self, inputs):
+        current_signal = inputs
+        for weights, biases in self.parameters:
+            current_signal = sigmoid(current_signal @ weights + biases)
+        return current_signal
+
+
+# ==============================================================================
+# Chapter 3: Learning on the Job - The Online Learner
+# ==============================================================================
+
+
+class OnlineLearner:
+    """
+    Keeps a NeuralNetwork learning from a stream of small batches.
+
+    network: the NeuralNetwork to keep training (it becomes private to us)
+    learning_rate: step size used by every update (the team's usual SGD)
+    replay_capacity: how many past guests to remember (0 turns replay off)
+    replay_ratio: remembered guests mixed in per new guest
+    publish_every: publish a new snapshot after this many updates
+    """
+
+    def __init__(
+        self,
+        network,
+        learning_rate,
+        replay_capacity=1000,
+        replay_ratio=1.0,
+        publish_every=1,
+    ):
+        if replay_ratio < 0:
+            raise ValueError(f"replay_ratio must be 0 or more, got {replay_ratio}")
+        if publish_every < 1:
+            raise ValueError(f"publish_every must be 1 or more, got {publish_every}")
+        self.network = network
+        self.learning_rate = learning_rate
+        self.replay_ratio = replay_ratio
+        self.publish_every = publish_every
+        self.replay = ReplayBuffer(
+            replay_capacity,
+            network.layers[0].weights.shape[0],
+            network.layers[-1].weights.shape[1],
+        )
+        self.updates = 0
+
+        # Only one lesson at a time; readers never take this lock
+        self._update_lock = threading.Lock()
+        self._snapshot = ModelSnapshot(network, version=0)
+
+    @property
+    def snapshot(self):
+        """The most recently published snapshot (one consistent set of weights)."""
+        return self._snapshot
+
+    def predict(self, inputs):
+        """What the door decides right now, from the published snapshot."""
+        return self._snapshot.forward(inputs)
+
+    def partial_fit(self, guest_features, correct_decisions):
+        """
+        Learn from one small batch of new guests.
+
+        The batch is mixed with guests recalled from the replay buffer, the
+        team takes one learning step on the mix, and then the new guests are
+        remembered for later. Returns the error on the new guests.
+
+        A single guest may be passed as a 1-D array, and decisions may be 1-D.
+        Sparse batches are not supported here (the replay memory is dense).
+        """
+        if is_sparse(guest_features):
+            raise TypeError(
+                "partial_fit takes dense batches; the replay buffer stores "
+                "guests densely. Convert with .toarray() first."
+            )
+        guest_features = np.atleast_2d(np.asarray(guest_features, dtype=float))
+        correct_decisions = np.asarray(correct_decisions, dtype=float).reshape(
+            -1, self.replay.decisions.shape[1]
+        )
+        if len(correct_decisions) != len(guest_features):
+            raise ValueError(
+                f"Got {len(guest_features)} guests but "
+                f"{len(correct_decisions)} decisions"
+            )
+
+        with self._update_lock:
+            num_recalled = int(len(guest_features) * self.replay_ratio)
+            if num_recalled and self.replay.size:
+                recalled_features, recalled_decisions = self.replay.sample(num_recalled)
+                lesson_features = np.vstack([guest_features, recalled_features])
+                lesson_decisions = np.vstack([correct_decisions, recalled_decisions])
+            else:
+                lesson_features, lesson_decisions = guest_features, correct_decisions
+
+            our_decisions = self.network.forward(lesson_features)
+            mistake_severity = mse(
+                correct_decisions, our_decisions[: len(guest_features)]
+            )
+            self.network.backward(lesson_decisions, our_decisions, self.learning_rate)
+
+            self.replay.add(guest_features, correct_decisions)
+            self.updates += 1
+            if self.updates % self.publish_every == 0:
+                self._publish()
+
+        return mistake_severity
+
+    def publish(self):
+        """Publish the team's current opinions to the door right away."""
+        with self._update_lock:
+            self._publish()
+
+    def _publish(self):
+        # Build the whole snapshot first, then swap a single reference:
+        # readers see either the old snapshot or the new one, never a mix
+        self._snapshot = ModelSnapshot(self.network, version=self.updates)
+
+
+if __name__ == "__main__":
+    print("🌙 The XOR Club stays open all night...")
+
+    X_stream = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+    y_stream = np.array([[0], [1], [1], [0]])
+
+    learner = OnlineLearner(
+        NeuralNetwork([2, 2, 1]), learning_rate=5.0, replay_capacity=64
+    )
+    for night in range(4000):
+        arrivals = np.random.randint(0, len(X_stream), size=2)
+        error = learner.partial_fit(X_stream[arrivals], y_stream[arrivals])
+        if (night + 1) % 1000 == 0:
+            print(f"📊 After {night + 1} arrivals, latest error: {error:.6f}")
+
+    print(f"📸 Door is using snapshot version {learner.snapshot.version}")
+    for guest, decision in zip(X_stream, learner.predict(X_stream)):
+        print(f"   {guest} → {decision[0]:.3f}")
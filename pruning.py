@@ -0,0 +1,254 @@
+"""
+The Percy Chronicles: Trimming the Staff
+========================================
+
+After a long season, Ada looks over her payroll. Some trust relationships
+(weights) have faded to almost nothing, and some specialists' advice is
+ignored by everyone downstream. They still get consulted on every guest,
+though - every `forward` pays for the full dense matrix product.
+
+Ada has two ways to trim:
+- Unstructured: forget individual faded trust relationships (zero every
+  weight below a threshold). The team keeps its shape; a mask makes sure the
+  forgotten weights stay forgotten during any refresher training.
+- Structured: let go of specialists whose outgoing advice is negligible, and
+  physically shrink the matrices on both sides of them, so every guest
+  really does cost less to process.
+
+Either way, a few refresher rounds (fine-tuning) can win back any lost
+accuracy, and the report compares the trimmed team against the original.
+"""
+
+import copy
+import time
+
+import numpy as np
+
+from neural_network import NeuralNetwork, is_sparse, mse
+
+PRUNING_MODES = ("unstructured", "structured")
+
+
+# ==============================================================================
+# Chapter 1: Forgetting Faded Trust - Unstructured Pruning
+# ==============================================================================
+
+
+def prune_unstructured(network, threshold):
+    """
+    Zero every weight whose magnitude is below `threshold`, in place.
+
+    Returns one boolean mask per layer (True = weight kept), to be reapplied
+    after each learning step so pruned weights stay at zero.
+    """
+    masks = []
+    for layer in network.layers:
+        mask = np.abs(layer.weights) >= threshold
+        layer.weights *= mask
+        masks.append(mask)
+    return masks
+
+
+# ==============================================================================
+# Chapter 2: Letting Specialists Go - Structured Pruning
+# ==============================================================================
+
+
+def _remove_neurons(network, should_keep):
+    """
+    Physically drop hidden neurons, shrinking both adjacent weight matrices.
+
+    `should_keep(outgoing_strength)` gets the largest outgoing weight magnitude
+    of each neuron and returns a boolean keep-mask. At least one neuron is
+    always kept per layer. Returns the number removed from each hidden layer.
+    """
+    removed_per_layer = []
+    for layer, next_layer in zip(network.layers[:-1], network.layers[1:]):
+        outgoing_strength = np.max(np.abs(next_layer.weights), axis=1)
+        keep = should_keep(outgoing_strength)
+        if not keep.any():
+            keep[np.argmax(outgoing_strength)] = True
+
+        layer.weights = layer.weights[:, keep]
+        layer.biases = layer.biases[:, keep]
+        next_layer.weights = next_layer.weights[keep]
+        removed_per_layer.append(int(np.sum(~keep)))
+
+    # Any remembered dance steps no longer match the new shapes
+    for layer in network.layers:
+        layer.inputs = None
+        layer.output = None
+
+    return removed_per_layer
+
+
+def prune_structured(network, threshold):
+    """
+    Remove hidden neurons whose outgoing weights are all below `threshold`,
+    shrinking the layer they live in and the layer they report to, in place.
+
+    Returns the number of neurons removed from each hidden layer.
+    """
+    return _remove_neurons(network, lambda strength: strength >= threshold)
+
+
+def compact(network):
+    """
+    Remove hidden neurons nobody listens to any more (all outgoing weights
+    exactly zero, e.g. after unstructured pruning), in place.
+
+    Their own activations still change, but nothing downstream sees them, so
+    the team's decisions stay exactly the same while every guest costs less.
+    """
+    return _remove_neurons(network, lambda strength: strength > 0)
+
+
+# ==============================================================================
+# Chapter 3: Refresher Training and the Report Card
+# ==============================================================================
+
+
+def fine_tune(network, X_train, y_train, epochs, learning_rate, masks=None):
+    """
+    A few quiet refresher rounds, one guest at a time like `NeuralNetwork.train`.
+
+    If `masks` is given (from `prune_unstructured`), pruned weights are held
+    at zero after every step.
+    """
+    for _ in range(epochs):
+        for guest_index, correct_decision in enumerate(y_train):
+            guest_features = X_train[guest_index : guest_index + 1]
+            our_decision = network.forward(guest_features)
+            network.backward(correct_decision, our_decision, learning_rate)
+            if masks is not None:
+                for layer, mask in zip(network.layers, masks):
+                    layer.weights *= mask
+
+
+def count_parameters(network):
+    """How many weights and biases the team has, and how many are non-zero."""
+    total = sum(l.weights.size + l.biases.size for l in network.layers)
+    nonzero = sum(
+        np.count_nonzero(l.weights) + np.count_nonzero(l.biases) for l in network.layers
+    )
+    return total, nonzero
+
+
+def accuracy(network, X_eval, y_eval):
+    """Share of correct decisions: 0.5 cut-off for one output, else argmax."""
+    decisions = network.forward(X_eval)
+    y_eval = np.asarray(y_eval).reshape(decisions.shape)
+    if decisions.shape[1] == 1:
+        return float(np.mean((decisions > 0.5) == (y_eval > 0.5)))
+    return float(np.mean(np.argmax(decisions, axis=1) == np.argmax(y_eval, axis=1)))
+
+
+def _time_forward(network, X_eval, repeats):
+    network.forward(X_eval)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        network.forward(X_eval)
+    return (time.perf_counter() - start) / repeats
+
+
+def prune(
+    network,
+    X_eval,
+    y_eval,
+    threshold,
+    mode="unstructured",
+    fine_tune_epochs=0,
+    X_train=None,
+    y_train=None,
+    learning_rate=0.1,
+    timing_repeats=100,
+):
+    """
+    Trim a trained team and report what it cost and what it saved.
+
+    The original network is left untouched; the pruned copy is returned along
+    with a report dict comparing parameters, error, accuracy and forward time
+    on (X_eval, y_eval). `threshold` is a weight magnitude and depends on the
+    scale the team was trained to, so it has no default. Fine-tuning needs
+    its own (X_train, y_train), so the report isn't scored on guests the
+    pruned team just practised on.
+    """
+    if mode not in PRUNING_MODES:
+        raise ValueError(f"mode must be one of {PRUNING_MODES}, got {mode!r}")
+    if fine_tune_epochs and (X_train is None or y_train is None):
+        raise ValueError("fine_tune_epochs needs X_train and y_train")
+
+    num_outputs = network.layers[-1].weights.shape[1]
+    y_eval = np.asarray(y_eval).reshape(-1, num_outputs)
+    num_eval = X_eval.shape[0] if is_sparse(X_eval) else len(X_eval)
+    if len(y_eval) != num_eval:
+        raise ValueError(
+            f"Got {num_eval} evaluation guests but {len(y_eval)} decisions"
+        )
+
+    pruned = copy.deepcopy(network)
+    report = {"mode": mode, "threshold": threshold}
+
+    if mode == "unstructured":
+        masks = prune_unstructured(pruned, threshold)
+    else:
+        masks = None
+        report["neurons_removed"] = prune_structured(pruned, threshold)
+
+    if fine_tune_epochs:
+        fine_tune(pruned, X_train, y_train, fine_tune_epochs, learning_rate, masks)
+
+    if mode == "unstructured":
+        # Zeroed weights alone don't make a dense matmul cheaper, but any
+        # specialist left with no outgoing trust can be let go for free
+        report["neurons_removed"] = compact(pruned)
+
+    for label, team in (("original", network), ("pruned", pruned)):
+        total, nonzero = count_parameters(team)
+        report[f"{label}_parameters"] = total
+        report[f"{label}_nonzero_parameters"] = nonzero
+        report[f"{label}_layer_sizes"] = [team.layers[0].weights.shape[0]] + [
+            l.weights.shape[1] for l in team.layers
+        ]
+        report[f"{label}_error"] = float(mse(y_eval, team.forward(X_eval)))
+        report[f"{label}_accuracy"] = accuracy(team, X_eval, y_eval)
+        report[f"{label}_forward_seconds"] = _time_forward(team, X_eval, timing_repeats)
+
+    report["speedup"] = (
+        report["original_forward_seconds"] / report["pruned_forward_seconds"]
+    )
+    report["accuracy_change"] = report["pruned_accuracy"] - report["original_accuracy"]
+    return pruned, report
+
+
+if __name__ == "__main__":
+    print("✂️  Ada reviews the payroll at The XOR Club...")
+
+    X_train = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+    y_train = np.array([[0], [1], [1], [0]])
+
+    # An overstaffed team: 16 specialists where two would do
+    overstaffed_team = NeuralNetwork([2, 16, 1])
+    for _ in range(5000):
+        our_decisions = overstaffed_team.forward(X_train)
+        overstaffed_team.apply_gradients(
+            overstaffed_team.compute_gradients(y_train, our_decisions), 10.0
+        )
+
+    # The XOR club only ever sees four kinds of guest, so the refresher
+    # rounds and the report card necessarily use the same four
+    for mode in PRUNING_MODES:
+        _, report = prune(
+            overstaffed_team,
+            X_train,
+            y_train,
+            threshold=2.0,
+            mode=mode,
+            fine_tune_epochs=200,
+            X_train=X_train,
+            y_train=y_train,
+            learning_rate=1.0,
+        )
+        print(f"\n📋 {mode} pruning report:")
+        for key, value in report.items():
+            print(f"   • {key}: {value}")
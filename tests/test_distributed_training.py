@@ -0,0 +1,259 @@
+import random
+import socket
+import threading
+
+import numpy as np
+import pytest
+
+from distributed_training import (
+    DistributedTrainer,
+    RingCommunicator,
+    launch_local_workers,
+    recv_array,
+    send_array,
+)
+from neural_network import NeuralNetwork
+
+
+def free_port_block(count):
+    """
+    A base port such that base_port ... base_port + count - 1 are all free.
+
+    Ports are drawn from below the kernel's ephemeral range, so an outgoing
+    connection from one club can't grab the port another club listens on.
+    """
+    while True:
+        base_port = random.randrange(20000, 30000)
+        sockets = []
+        try:
+            for port in range(base_port, base_port + count):
+                sock = socket.socket()
+                sockets.append(sock)
+                sock.bind(("127.0.0.1", port))
+            return base_port
+        except OSError:
+            continue
+        finally:
+            for sock in sockets:
+                sock.close()
+
+
+def run_ring(world_size, work):
+    """Run `work(communicator)` on one thread per club; return results by rank."""
+    base_port = free_port_block(world_size)
+    addresses = [("127.0.0.1", base_port + rank) for rank in range(world_size)]
+    results, errors = {}, []
+
+    def club(rank):
+        communicator = RingCommunicator(addresses, rank, io_timeout=10.0)
+        try:
+            results[rank] = work(communicator)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            communicator.close()
+
+    threads = [threading.Thread(target=club, args=(r,)) for r in range(world_size)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    if errors:
+        raise errors[0]
+    return results
+
+
+def test_send_and_recv_array_round_trip():
+    left, right = socket.socketpair()
+    with left, right:
+        for array in (np.arange(7.0), np.array([]), np.random.randn(1000)):
+            send_array(left, array)
+            np.testing.assert_array_equal(recv_array(right), array)
+
+
+@pytest.mark.parametrize("world_size", [1, 2, 3])
+@pytest.mark.parametrize("length", [1, 2, 7, 100])
+def test_allreduce_sums_across_the_ring(world_size, length):
+    contributions = [np.random.randn(length) for _ in range(world_size)]
+    results = run_ring(
+        world_size, lambda comm: comm.allreduce(contributions[comm.rank])
+    )
+
+    expected = np.sum(contributions, axis=0)
+    for rank in range(world_size):
+        np.testing.assert_allclose(results[rank], expected)
+    # Every club ends up with exactly the same bytes
+    for rank in range(1, world_size):
+        np.testing.assert_array_equal(results[rank], results[0])
+
+
+def train_on_ring(layer_sizes, starting_params, X, y, world_size, **train_kwargs):
+    """Train one DistributedTrainer per club from the same starting weights."""
+
+    def work(comm):
+        network = NeuralNetwork(layer_sizes)
+        for layer, (weights, biases) in zip(network.layers, starting_params):
+            layer.weights, layer.biases = weights.copy(), biases.copy()
+        trainer = DistributedTrainer(network, comm)
+        trainer.train(
+            X[comm.rank :: world_size], y[comm.rank :: world_size], **train_kwargs
+        )
+        trainer.close()
+        return network
+
+    return run_ring(world_size, work)
+
+
+@pytest.mark.parametrize("overlap", [False, True])
+def test_trainer_matches_single_node_averaged_sgd(overlap):
+    X = np.random.rand(8, 3)
+    y = np.random.rand(8, 1)
+    world_size, batch_size, epochs, learning_rate = 2, 2, 3, 0.5
+    reference = NeuralNetwork([3, 4, 1])
+    starting_params = [(l.weights.copy(), l.biases.copy()) for l in reference.layers]
+
+    networks = train_on_ring(
+        [3, 4, 1],
+        starting_params,
+        X,
+        y,
+        world_size,
+        epochs=epochs,
+        learning_rate=learning_rate,
+        batch_size=batch_size,
+        overlap=overlap,
+    )
+
+    # With overlap, each batch's averaged gradient lands one step late: it is
+    # computed on the current weights, the previous average is applied, and
+    # whatever is still pending is flushed at the end of the epoch
+    shards = [(X[r::world_size], y[r::world_size]) for r in range(world_size)]
+    for _ in range(epochs):
+        pending = None
+        for start in range(0, len(shards[0][0]), batch_size):
+            batch = slice(start, start + batch_size)
+            per_club = []
+            for X_shard, y_shard in shards:
+                decisions = reference.forward(X_shard[batch])
+                per_club.append(reference.compute_gradients(y_shard[batch], decisions))
+            averaged = [
+                tuple(np.mean([g[i][j] for g in per_club], axis=0) for j in range(2))
+                for i in range(len(reference.layers))
+            ]
+            if pending is not None:
+                reference.apply_gradients(pending, learning_rate)
+                pending = None
+            if overlap:
+                pending = averaged
+            else:
+                reference.apply_gradients(averaged, learning_rate)
+        if pending is not None:
+            reference.apply_gradients(pending, learning_rate)
+
+    for network in networks.values():
+        for layer, expected in zip(network.layers, reference.layers):
+            np.testing.assert_allclose(layer.weights, expected.weights)
+            np.testing.assert_allclose(layer.biases, expected.biases)
+
+
+def test_trainer_accepts_1d_labels_with_batches():
+    X = np.random.rand(8, 3)
+    y = np.random.rand(8)
+    starting_params = [(l.weights, l.biases) for l in NeuralNetwork([3, 4, 1]).layers]
+    train_kwargs = dict(epochs=2, learning_rate=0.5, batch_size=2)
+
+    flat = train_on_ring([3, 4, 1], starting_params, X, y, 2, **train_kwargs)
+    column = train_on_ring(
+        [3, 4, 1], starting_params, X, y.reshape(-1, 1), 2, **train_kwargs
+    )
+    for rank in range(2):
+        for a, b in zip(flat[rank].layers, column[rank].layers):
+            np.testing.assert_array_equal(a.weights, b.weights)
+
+
+def test_trainer_rejects_uneven_batch_counts():
+    def work(comm):
+        network = NeuralNetwork([2, 2, 1])
+        trainer = DistributedTrainer(network, comm)
+        try:
+            num_guests = 3 if comm.rank == 0 else 2
+            with pytest.raises(ValueError):
+                trainer.train(
+                    np.zeros((num_guests, 2)), np.zeros((num_guests, 1)), 1, 0.1
+                )
+        finally:
+            trainer.close()
+        return True
+
+    assert run_ring(2, work) == {0: True, 1: True}
+
+
+def test_launch_local_workers_trains_two_clubs():
+    X = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+    y = np.array([[0], [1], [1], [0]])
+    network, history = launch_local_workers(
+        [2, 2, 1],
+        X,
+        y,
+        num_workers=2,
+        epochs=3000,
+        learning_rate=10.0,
+        base_port=free_port_block(2),
+    )
+    assert len(history) == 3000
+    assert history[-1] < history[0]
+    np.testing.assert_array_equal(network.forward(X) > 0.5, y == 1)
+
+
+def test_launch_local_workers_rejects_uneven_split():
+    X = np.zeros((5, 2))
+    y = np.zeros((5, 1))
+    with pytest.raises(ValueError):
+        launch_local_workers(
+            [2, 2, 1], X, y, num_workers=2, epochs=1, learning_rate=0.1
+        )
+
+
+def test_launch_local_workers_fails_fast_when_a_club_dies():
+    base_port = free_port_block(2)
+    X = np.zeros((4, 2))
+    y = np.zeros((4, 1))
+    # Occupy rank 1's port so that club cannot open its door
+    blocker = socket.socket()
+    blocker.bind(("127.0.0.1", base_port + 1))
+    blocker.listen(1)
+    with blocker, pytest.raises(RuntimeError):
+        launch_local_workers(
+            [2, 2, 1],
+            X,
+            y,
+            num_workers=2,
+            epochs=1,
+            learning_rate=0.1,
+            base_port=base_port,
+        )
+
+
+def test_trainer_accepts_sparse_shards():
+    import scipy.sparse as sp
+
+    X = (np.random.rand(8, 20) < 0.2) * 1.0
+    y = np.random.rand(8, 1)
+
+    starting_params = [(l.weights, l.biases) for l in NeuralNetwork([20, 3, 1]).layers]
+
+    def work(comm, shard_format):
+        network = NeuralNetwork([20, 3, 1])
+        for layer, (weights, biases) in zip(network.layers, starting_params):
+            layer.weights, layer.biases = weights.copy(), biases.copy()
+        trainer = DistributedTrainer(network, comm)
+        X_shard = shard_format(X[comm.rank :: 2])
+        trainer.train(X_shard, y[comm.rank :: 2], 2, 0.5, batch_size=2)
+        trainer.close()
+        return network
+
+    dense = run_ring(2, lambda comm: work(comm, np.asarray))
+    sparse = run_ring(2, lambda comm: work(comm, sp.csr_matrix))
+    for rank in range(2):
+        for a, b in zip(dense[rank].layers, sparse[rank].layers):
+            np.testing.assert_allclose(a.weights, b.weights)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from neural_network import NeuralNetwork, is_sparse
+
+
+def twin_networks(layer_sizes):
+    first, second = NeuralNetwork(layer_sizes), NeuralNetwork(layer_sizes)
+    for a, b in zip(first.layers, second.layers):
+        b.weights, b.biases = a.weights.copy(), a.biases.copy()
+    return first, second
+
+
+def sparse_batch(num_guests=16, num_features=40):
+    dense = (np.random.rand(num_guests, num_features) < 0.1) * np.random.rand(
+        num_guests, num_features
+    )
+    return dense, np.random.randint(0, 2, (num_guests, 1))
+
+
+def assert_same_weights(first, second):
+    for a, b in zip(first.layers, second.layers):
+        np.testing.assert_allclose(a.weights, b.weights)
+        np.testing.assert_allclose(a.biases, b.biases)
+
+
+@pytest.mark.parametrize("csr", [sp.csr_matrix, sp.csr_array])
+def test_sparse_backward_matches_dense(csr):
+    X, y = sparse_batch()
+    dense_team, sparse_team = twin_networks([40, 5, 1])
+    for _ in range(5):
+        dense_team.backward(y, dense_team.forward(X), 0.5)
+        sparse_team.backward(y, sparse_team.forward(csr(X)), 0.5)
+    assert_same_weights(dense_team, sparse_team)
+
+
+def test_sparse_gradients_only_hold_touched_rows():
+    X, y = sparse_batch()
+    X[:, 7] = 0.0  # nobody has feature 7
+    dense_team, sparse_team = twin_networks([40, 5, 1])
+
+    gradients = sparse_team.compute_gradients(y, sparse_team.forward(sp.csr_matrix(X)))
+    touched_rows, row_adjustments = gradients[0][0]
+    assert 7 not in touched_rows
+    assert row_adjustments.shape == (touched_rows.size, 5)
+
+    sparse_team.apply_gradients(gradients, 0.5)
+    dense_team.apply_gradients(
+        dense_team.compute_gradients(y, dense_team.forward(X)), 0.5
+    )
+    assert_same_weights(dense_team, sparse_team)
+
+
+def test_train_accepts_sparse_and_dense_inputs():
+    X = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+    y = np.array([[0], [1], [1], [0]])
+    dense_team, sparse_team = twin_networks([2, 2, 1])
+    dense_team.train(X, y, 3, 1.0)
+    sparse_team.train(sp.csr_matrix(X), y, 3, 1.0)
+    assert_same_weights(dense_team, sparse_team)
+
+
+def test_train_still_accepts_a_list_of_rows():
+    rows = [np.array([0, 1]), np.array([1, 0])]
+    y = np.array([[1], [1]])
+    list_team, array_team = twin_networks([2, 2, 1])
+    starting_weights = list_team.layers[0].weights.copy()
+
+    list_team.train(rows, y, 2, 1.0)
+    array_team.train(np.array(rows), y, 2, 1.0)
+
+    assert not np.array_equal(list_team.layers[0].weights, starting_weights)
+    assert_same_weights(list_team, array_team)
+
+
+@pytest.mark.parametrize("fmt", ["csc", "coo", "bsr"])
+def test_other_sparse_formats_are_rejected(fmt):
+    X, y = sparse_batch(num_guests=40)
+    other_format = sp.csr_matrix(X).asformat(fmt)
+    team = NeuralNetwork([40, 5, 1])
+    with pytest.raises(TypeError):
+        team.forward(other_format)
+    with pytest.raises(TypeError):
+        team.train(other_format, y, 1, 0.1)
+
+
+@pytest.mark.parametrize("fmt", ["csr", "csc", "coo", "bsr"])
+def test_is_sparse_only_probes(fmt):
+    X, _ = sparse_batch(num_guests=40)
+    assert is_sparse(sp.csr_matrix(X).asformat(fmt))
+
+
+def test_dense_inputs_are_not_sparse():
+    assert not is_sparse(np.zeros((2, 2)))
+    assert not is_sparse([[0, 1]])
@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from neural_network import NeuralNetwork
+from online_learning import OnlineLearner, ReplayBuffer
+
+
+def test_replay_buffer_overwrites_oldest_guests():
+    buffer = ReplayBuffer(3, 1, 1)
+    buffer.add(np.array([[0.0], [1.0]]), np.zeros((2, 1)))
+    buffer.add(np.array([[2.0], [3.0], [4.0], [5.0], [6.0]]), np.zeros((5, 1)))
+    assert buffer.size == 3
+    assert sorted(buffer.features.ravel()) == [4.0, 5.0, 6.0]
+
+
+def test_replay_can_be_turned_off():
+    learner = OnlineLearner(NeuralNetwork([2, 2, 1]), 1.0, replay_capacity=0)
+    for _ in range(3):
+        learner.partial_fit(np.array([[0, 1], [1, 0]]), np.array([[1], [1]]))
+    assert learner.replay.size == 0
+
+
+def test_negative_capacity_is_rejected():
+    with pytest.raises(ValueError):
+        ReplayBuffer(-1, 2, 1)
+
+
+@pytest.mark.parametrize(
+    "bad_setting", [{"publish_every": 0}, {"publish_every": -1}, {"replay_ratio": -0.5}]
+)
+def test_bad_learner_settings_are_rejected(bad_setting):
+    with pytest.raises(ValueError):
+        OnlineLearner(NeuralNetwork([2, 2, 1]), 1.0, **bad_setting)
+
+
+def test_partial_fit_accepts_a_single_1d_guest():
+    learner = OnlineLearner(NeuralNetwork([2, 2, 1]), 1.0)
+    learner.partial_fit(np.array([0, 1]), 1)
+    learner.partial_fit(np.array([[0, 1], [1, 1]]), np.array([1, 0]))
+    assert learner.replay.size == 3
+
+
+def test_partial_fit_rejects_sparse_batches():
+    learner = OnlineLearner(NeuralNetwork([2, 2, 1]), 1.0)
+    with pytest.raises(TypeError):
+        learner.partial_fit(sp.csr_matrix(np.array([[0, 1]])), np.array([[1]]))
+
+
+def test_published_snapshots_are_consistent_while_learning():
+    learner = OnlineLearner(NeuralNetwork([2, 4, 1]), 1.0, publish_every=1)
+    X = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+    y = np.array([[0], [1], [1], [0]])
+    stop = threading.Event()
+    mismatches = []
+
+    def door():
+        while not stop.is_set():
+            snapshot = learner.snapshot
+            first, second = snapshot.forward(X), snapshot.forward(X)
+            if not np.array_equal(first, second):
+                mismatches.append(snapshot.version)
+
+    reader = threading.Thread(target=door)
+    reader.start()
+    for _ in range(200):
+        learner.partial_fit(X[:2], y[:2])
+    stop.set()
+    reader.join()
+
+    assert not mismatches
+    assert learner.snapshot.version == 200
+    with pytest.raises(ValueError):
+        learner.snapshot.parameters[0][0][0, 0] = 1.0
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from neural_network import NeuralNetwork
+from pruning import (
+    accuracy,
+    compact,
+    fine_tune,
+    prune,
+    prune_structured,
+    prune_unstructured,
+)
+
+
+def test_prune_requires_a_threshold():
+    with pytest.raises(TypeError):
+        prune(NeuralNetwork([2, 2, 1]), np.zeros((2, 2)), np.zeros((2, 1)))
+
+
+def test_unstructured_pruning_zeroes_small_weights_and_keeps_them_zero():
+    X, y = np.random.rand(8, 4), np.random.rand(8, 1)
+    team = NeuralNetwork([4, 6, 1])
+    masks = prune_unstructured(team, 0.05)
+    fine_tune(team, X, y, 3, 0.5, masks)
+    for layer, mask in zip(team.layers, masks):
+        assert np.all(layer.weights[~mask] == 0)
+        assert np.all(layer.weights[mask] != 0)
+
+
+def test_fine_tuning_needs_its_own_training_data():
+    X, y = np.random.rand(4, 2), np.random.rand(4, 1)
+    with pytest.raises(ValueError):
+        prune(NeuralNetwork([2, 2, 1]), X, y, threshold=0.01, fine_tune_epochs=1)
+
+
+def test_structured_pruning_shrinks_adjacent_layers():
+    team = NeuralNetwork([3, 5, 2])
+    team.layers[1].weights[[1, 3]] = 0.0
+    assert prune_structured(team, 1e-6) == [2]
+    assert team.layers[0].weights.shape == (3, 3)
+    assert team.layers[0].biases.shape == (1, 3)
+    assert team.layers[1].weights.shape == (3, 2)
+
+
+def test_compaction_keeps_decisions_identical():
+    X = np.random.rand(10, 3)
+    team = NeuralNetwork([3, 5, 1])
+    prune_unstructured(team, 0.0)
+    team.layers[1].weights[2] = 0.0
+    before = team.forward(X)
+    assert compact(team) == [1]
+    np.testing.assert_allclose(team.forward(X), before)
+
+
+def test_accuracy_handles_1d_labels():
+    X = np.array([[0, 0], [0, 1], [1, 0], [1, 1]])
+    team = NeuralNetwork([2, 2, 1])
+    labels = (team.forward(X) > 0.5).astype(float)
+    assert accuracy(team, X, labels.ravel()) == 1.0
+    _, report = prune(team, X, labels.ravel(), threshold=0.0)
+    assert report["original_accuracy"] == 1.0